@@ -6,14 +6,11 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/aeon2yw
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import argparse
-from pathlib import Path
 from pywriter.pywriter_globals import *
 from pywriter.ui.ui import Ui
 from pywriter.ui.ui_tk import UiTk
 from pywriter.ui.set_icon_tk import *
-from pywriter.config.configuration import Configuration
-from aeon2ywlib.aeon2_converter import Aeon2Converter
+from aeon2ywlib.aeon2_runtime import run_conversion
 
 SUFFIX = ''
 APPNAME = 'aeon2yw'
@@ -45,26 +42,13 @@ def run(sourcePath, silentMode=True, installDir='.'):
         ui = UiTk(f'{_("Synchronize Aeon Timeline 2 and yWriter")} @release')
         set_icon(ui.root, icon='aLogo32')
 
-    #--- Try to get persistent configuration data
-    sourceDir = os.path.dirname(sourcePath)
-    if not sourceDir:
-        sourceDir = '.'
-    iniFileName = f'{APPNAME}.ini'
-    iniFiles = [f'{installDir}/{iniFileName}', f'{sourceDir}/{iniFileName}']
-    configuration = Configuration(SETTINGS, OPTIONS)
-    for iniFile in iniFiles:
-        configuration.read(iniFile)
-    kwargs = {'suffix': SUFFIX}
-    kwargs.update(configuration.settings)
-    kwargs.update(configuration.options)
-    converter = Aeon2Converter()
-    converter.ui = ui
-
-    converter.run(sourcePath, **kwargs)
+    run_conversion(ui, sourcePath, SETTINGS, OPTIONS, APPNAME, installDir, suffix=SUFFIX)
     ui.start()
 
 
 if __name__ == '__main__':
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Synchronize Aeon Timeline 2 and yWriter',
         epilog='')
@@ -76,9 +60,10 @@ if __name__ == '__main__':
                         action="store_true",
                         help='suppress error messages and the request to confirm overwriting')
     args = parser.parse_args()
-    try:
-        homeDir = str(Path.home()).replace('\\', '/')
+    homeDir = os.path.expanduser('~').replace('\\', '/')
+    if homeDir != '~':
         installDir = f'{homeDir}/.pywriter/{APPNAME}/config'
-    except:
+    else:
+        # No home directory found; expanduser() returns the path unchanged.
         installDir = '.'
     run(args.sourcePath, args.silent, installDir)
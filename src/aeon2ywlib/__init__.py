@@ -8,6 +8,8 @@ yw7_target -- Provide a class for a yWriter7 project to get updates from Aeon Ti
 uid_helper -- Provide a GUID generator for Aeon Timeline 2.
 aeon2_converter -- Provide a converter class for Aeon Timeline 2 and yWriter.
 aeon2_fop -- Provide helper functions for Aeon Timeline 2 file operation.
+aeon2_runtime -- Provide helper functions for running the Aeon Timeline 2 converter.
+file_helper -- Provide a helper function for detecting file changes.
 
 Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/aeon2yw
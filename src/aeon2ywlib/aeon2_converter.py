@@ -18,6 +18,17 @@ class Aeon2Converter(YwCnvUi):
         run(sourcePath, **kwargs) -- Create source and target objects and run conversion.
     """
 
+    def __init__(self):
+        """Register the conversion methods by source file extension.
+        
+        Extends the superclass constructor.
+        """
+        super().__init__()
+        self._conversions = {
+            JsonTimeline2.EXTENSION: self._convert_from_timeline,
+            Yw7File.EXTENSION: self._convert_from_yw,
+        }
+
     def run(self, sourcePath, **kwargs):
         """Create source and target objects and run conversion.
 
@@ -32,22 +43,28 @@ class Aeon2Converter(YwCnvUi):
             return
 
         fileName, fileExtension = os.path.splitext(sourcePath)
-        if fileExtension == JsonTimeline2.EXTENSION:
-            # Source is a timeline
-            sourceFile = JsonTimeline2(sourcePath, **kwargs)
-            if os.path.isfile(f'{fileName}{Yw7File.EXTENSION}'):
-                # Update existing yWriter project from timeline
-                targetFile = Yw7File(f'{fileName}{Yw7File.EXTENSION}', **kwargs)
-                self.import_to_yw(sourceFile, targetFile)
-            else:
-                # Create new yWriter project from timeline
-                targetFile = Yw7File(f'{fileName}{Yw7File.EXTENSION}', **kwargs)
-                self.create_yw7(sourceFile, targetFile)
-        elif fileExtension == Yw7File.EXTENSION:
-            # Update existing timeline from yWriter project
-            sourceFile = Yw7File(sourcePath, **kwargs)
-            targetFile = JsonTimeline2(f'{fileName}{JsonTimeline2.EXTENSION}', **kwargs)
-            self.export_from_yw(sourceFile, targetFile)
-        else:
+        convert = self._conversions.get(fileExtension)
+        if convert is None:
             # Source file format is not supported
             self.ui.set_info_how(f'!{_("File type is not supported")}: "{norm_path(sourcePath)}".')
+            return
+
+        convert(sourcePath, fileName, **kwargs)
+
+    def _convert_from_timeline(self, sourcePath, fileName, **kwargs):
+        """Create or update a yWriter project from a timeline."""
+        sourceFile = JsonTimeline2(sourcePath, **kwargs)
+        ywPath = f'{fileName}{Yw7File.EXTENSION}'
+        targetFile = Yw7File(ywPath, **kwargs)
+        if os.path.isfile(ywPath):
+            # Update existing yWriter project from timeline
+            self.import_to_yw(sourceFile, targetFile)
+        else:
+            # Create new yWriter project from timeline
+            self.create_yw7(sourceFile, targetFile)
+
+    def _convert_from_yw(self, sourcePath, fileName, **kwargs):
+        """Update an existing timeline from a yWriter project."""
+        sourceFile = Yw7File(sourcePath, **kwargs)
+        targetFile = JsonTimeline2(f'{fileName}{JsonTimeline2.EXTENSION}', **kwargs)
+        self.export_from_yw(sourceFile, targetFile)
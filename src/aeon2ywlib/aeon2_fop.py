@@ -5,11 +5,68 @@ For further information see https://github.com/peter88213/aeon2yw
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import zipfile
-import codecs
+import zlib
+import struct
 import json
 import os
-from pywriter.pywriter_globals import *
+import time
+import hashlib
+import shutil
+from pywriter.pywriter_globals import Error, _, norm_path
+from aeon2ywlib.file_helper import get_file_stamp
 from json import JSONDecodeError
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library.
+    orjson = None
+try:
+    import ijson
+except ImportError:
+    # Always parse the whole JSON data at once.
+    ijson = None
+
+STREAMING_SIZE = 16 * 1024 * 1024
+# Uncompressed size above which timeline.json is parsed incrementally, if ijson is available.
+
+COMPRESS_LEVEL = 3
+# Default deflate level for saving; much faster than zlib's default 6 at nearly the same size.
+
+STORED_SIZE = 4096
+# Timelines smaller than this are saved uncompressed.
+
+CACHE_SIZE = 8 * 1024 * 1024
+# Larger timeline.json data is not kept in memory after reading or writing.
+
+# Error messages, translated once at import.
+INVALID_TIMELINE_MSG = f'{_("Invalid JSON data in timeline")}.'
+UNREADABLE_TIMELINE_MSG = f'{_("Cannot read timeline data")}.'
+NO_TIMELINE_JSON_MSG = f'{_("No JSON part found in timeline data")}.'
+TIMELINE_WRITE_MSG = _("Cannot write file")
+TIMELINE_OVERWRITE_MSG = _("Cannot overwrite file")
+
+_TIMELINE_CACHE = {}
+# Timeline data by real path: (file stamp, timeline.json bytes or None, digest of the bytes if written here)
+
+
+def stream_json_member(myzip, info):
+    """Parse a JSON object from a zip archive member while inflating it.
+
+    Positional arguments:
+        myzip -- ZipFile instance opened for reading.
+        info -- ZipInfo instance of the archive member to read.
+
+    Build the object from its top-level items, so neither the whole 
+    uncompressed bytes nor a decoded string are held in memory.
+    Return a dictionary.
+    Raise the "Error" exception in case of invalid JSON data. 
+    """
+    with myzip.open(info) as jsonFile:
+        try:
+            return dict(ijson.kvitems(jsonFile, '', use_float=True))
+
+        except ijson.JSONError:
+            raise Error(INVALID_TIMELINE_MSG)
 
 
 def open_timeline(filePath):
@@ -19,45 +76,149 @@ def open_timeline(filePath):
         filePath -- Path of the .aeon project file to read.
         
     Return a Python object containing the timeline structure.
+    Use orjson for parsing, if available.
+    Parse very large timelines incrementally, if ijson is available.
+    Unless it is very large, the decompressed data is cached as long as 
+    the file does not change, so reopening a project skips the decompression. 
     Raise the "Error" exception in case of error. 
     """
     try:
-        with zipfile.ZipFile(filePath, 'r') as myzip:
-            jsonBytes = myzip.read('timeline.json')
-            jsonStr = codecs.decode(jsonBytes, encoding='utf-8')
-    except:
-        raise Error(f'{_("Cannot read timeline data")}.')
-    if not jsonStr:
-        raise Error(f'{_("No JSON part found in timeline data")}.')
+        cacheKey = os.path.realpath(filePath)
+        fileStat = os.stat(filePath)
+        fileStamp = (fileStat.st_mtime_ns, fileStat.st_size)
+        cached = _TIMELINE_CACHE.get(cacheKey)
+        if cached is not None and cached[0] == fileStamp and cached[1] is not None:
+            jsonBytes = cached[1]
+        else:
+            with zipfile.ZipFile(filePath, 'r') as myzip:
+                info = myzip.getinfo('timeline.json')
+                if ijson is not None and info.file_size > STREAMING_SIZE:
+                    return stream_json_member(myzip, info)
+
+                jsonBytes = myzip.read(info)
+            if len(jsonBytes) <= CACHE_SIZE:
+                _TIMELINE_CACHE[cacheKey] = (fileStamp, jsonBytes, None)
+    except (OSError, EOFError, KeyError, zipfile.BadZipFile, zlib.error, struct.error,
+            NotImplementedError, RuntimeError):
+        # NotImplementedError: unsupported compression method; RuntimeError: encrypted member.
+        raise Error(UNREADABLE_TIMELINE_MSG)
+    if not jsonBytes:
+        raise Error(NO_TIMELINE_JSON_MSG)
     try:
-        jsonData = json.loads(jsonStr)
-    except JSONDecodeError:
-        raise Error(f'{_("Invalid JSON data in timeline")}.')
+        # Both parsers decode the UTF-8 bytes themselves.
+        if orjson is None:
+            jsonData = json.loads(jsonBytes)
+        else:
+            jsonData = orjson.loads(jsonBytes)
+    except (JSONDecodeError, UnicodeDecodeError):
+        raise Error(INVALID_TIMELINE_MSG)
     return jsonData
 
 
-def save_timeline(jsonData, filePath):
+def backup_file(filePath):
+    """Keep the current state of filePath as filePath.bak, replacing an older backup.
+
+    Positional arguments:
+        filePath -- Path of the file to back up.
+
+    Create a hard link, so nothing is copied, if the file system permits it.
+    The new backup is created under a temporary name, and replaces the 
+    older backup only when it is complete.
+    Do nothing, if filePath does not exist.
+    Raise OSError in case of error.
+    """
+    backupPath = f'{filePath}.bak'
+    tmpBackupPath = f'{backupPath}.tmp'
+    try:
+        os.link(filePath, tmpBackupPath)
+    except FileNotFoundError:
+        # Nothing to back up.
+        return
+
+    except OSError:
+        # Hard links are not supported here, or an interrupted save left a temporary backup.
+        remove_tmp_file(tmpBackupPath)
+        shutil.copy2(filePath, tmpBackupPath)
+    os.replace(tmpBackupPath, backupPath)
+
+
+def remove_tmp_file(tmpPath):
+    """Delete a temporary file, if it exists."""
+    try:
+        os.remove(tmpPath)
+    except OSError:
+        pass
+
+
+def cache_payload(cacheKey, fileStamp, payload, digest):
+    """Remember the timeline data just written; keep only the digest of large data."""
+    if len(payload) > CACHE_SIZE:
+        payload = None
+    _TIMELINE_CACHE[cacheKey] = (fileStamp, payload, digest)
+
+
+def save_timeline(jsonData, filePath, compresslevel=COMPRESS_LEVEL):
     """Write the timeline to a zipfile located at filePath.
     
     Positional arguments:
         jsonData -- Python object containing the timeline structure.
         filePath -- Path of the .aeon project file to write.
         
+    Optional arguments:
+        compresslevel: int -- deflate level from 1 (fastest) to 9 (smallest).
+
+    Use orjson for serializing, if available.
+    The JSON data is serialized once to UTF-8 bytes, which are passed 
+    to the compressor as they are. Very small timelines are stored 
+    uncompressed.
+    If the file still holds exactly what was last saved here, it is not 
+    rewritten, but only gets a new modification time.
+    The new file is written under a temporary name and then replaces the 
+    old one, so filePath always holds a complete timeline.
     Raise the "Error" exception in case of error. 
     """
-    backedUp = False
-    if os.path.isfile(filePath):
+    try:
+        if orjson is None:
+            # Compact like orjson; no whitespace to build, encode, and compress.
+            payload = json.dumps(jsonData, separators=(',', ':')).encode('utf-8')
+        else:
+            payload = orjson.dumps(jsonData)
+    except (TypeError, ValueError):
+        # Not serializable; leave the existing file untouched.
+        raise Error(f'{TIMELINE_WRITE_MSG}: "{norm_path(filePath)}".')
+
+    cacheKey = os.path.realpath(filePath)
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    cached = _TIMELINE_CACHE.pop(cacheKey, None)
+    if cached is not None and cached[2] == digest and cached[0] == get_file_stamp(filePath):
+        # The file already contains this timeline; just mark it as saved.
         try:
-            os.replace(filePath, f'{filePath}.bak')
-        except:
-            raise Error(f'{_("Cannot overwrite file")}: "{norm_path(filePath)}".')
+            os.utime(filePath)
+        except OSError:
+            raise Error(f'{TIMELINE_WRITE_MSG}: "{norm_path(filePath)}".')
+
+        cache_payload(cacheKey, get_file_stamp(filePath), payload, digest)
+        return
+
+    tmpPath = f'{filePath}.tmp'
+    try:
+        zipInfo = zipfile.ZipInfo('timeline.json', date_time=time.localtime()[:6])
+        if len(payload) < STORED_SIZE:
+            zipInfo.compress_type = zipfile.ZIP_STORED
         else:
-            backedUp = True
+            zipInfo.compress_type = zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(tmpPath, 'w') as f:
+            f.writestr(zipInfo, payload, compresslevel=compresslevel)
+    except (OSError, zipfile.LargeZipFile):
+        remove_tmp_file(tmpPath)
+        raise Error(f'{TIMELINE_WRITE_MSG}: "{norm_path(filePath)}".')
+
     try:
-        with zipfile.ZipFile(filePath, 'w', compression=zipfile.ZIP_DEFLATED) as f:
-            f.writestr('timeline.json', json.dumps(jsonData))
-    except:
-        if backedUp:
-            os.replace(f'{filePath}.bak', filePath)
-        raise Error(f'{_("Cannot write file")}: "{norm_path(filePath)}".')
+        backup_file(filePath)
+        os.replace(tmpPath, filePath)
+    except OSError:
+        remove_tmp_file(tmpPath)
+        raise Error(f'{TIMELINE_OVERWRITE_MSG}: "{norm_path(filePath)}".')
+
+    cache_payload(cacheKey, get_file_stamp(filePath), payload, digest)
 
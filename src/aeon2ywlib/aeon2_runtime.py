@@ -0,0 +1,98 @@
+"""Provide helper functions for running the Aeon Timeline 2 converter.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/aeon2yw
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.config.configuration import Configuration
+from aeon2ywlib.aeon2_converter import Aeon2Converter
+from aeon2ywlib.file_helper import get_file_stamp
+
+_CONFIG_CACHE = {}
+# Merged configuration by INI files and defaults: (INI file stamps, configuration)
+_sharedConverter = None
+
+
+def load_config(iniFile, fileStamp, settings, options):
+    """Return the settings and options read from iniFile.
+
+    Positional arguments:
+        iniFile: str -- path of the configuration file.
+        fileStamp -- (modification time, size) of iniFile, or None if it does not exist.
+        settings: dict -- default settings.
+        options: dict -- default options.
+
+    Return a tuple of two dictionaries containing only the entries 
+    defined in the file.
+    """
+    if fileStamp is None:
+        # No configuration file; nothing to parse.
+        return {}, {}
+
+    configuration = Configuration(dict.fromkeys(settings), dict.fromkeys(options))
+    configuration.read(iniFile)
+    iniSettings = {k: v for k, v in configuration.settings.items() if v is not None}
+    iniOptions = {k: v for k, v in configuration.options.items() if v is not None}
+    return iniSettings, iniOptions
+
+
+def merge_config(iniFiles, settings, options):
+    """Return the defaults, overridden by the entries of the INI files.
+
+    Positional arguments:
+        iniFiles: list -- paths of the configuration files; later files override earlier ones.
+        settings: dict -- default settings.
+        options: dict -- default options.
+
+    Return a dictionary containing settings and options.
+    The result is cached and reused as long as no INI file's 
+    modification time and size change.
+    """
+    fileStamps = tuple(get_file_stamp(iniFile) for iniFile in iniFiles)
+    cacheKey = (tuple(iniFiles), tuple(settings.items()), tuple(options.items()))
+    cached = _CONFIG_CACHE.get(cacheKey)
+    if cached is not None and cached[0] == fileStamps:
+        return cached[1]
+
+    config = {}
+    config.update(settings)
+    config.update(options)
+    for iniFile, fileStamp in zip(iniFiles, fileStamps):
+        iniSettings, iniOptions = load_config(iniFile, fileStamp, settings, options)
+        config.update(iniSettings)
+        config.update(iniOptions)
+    _CONFIG_CACHE[cacheKey] = (fileStamps, config)
+    return config
+
+
+def run_conversion(ui, sourcePath, settings, options, appName, installDir='.', **kwargs):
+    """Read the persistent configuration and run the converter.
+
+    Positional arguments:
+        ui -- user interface instance used by the converter.
+        sourcePath: str -- the source file path.
+        settings: dict -- default settings.
+        options: dict -- default options.
+        appName: str -- name of the INI file without extension.
+
+    Optional arguments:
+        installDir: str -- directory containing the installation-wide INI file.
+        kwargs -- additional keyword arguments passed to the converter.
+
+    The INI file in the source directory overrides the installation-wide one.
+    The converter instance is created on the first call and reused afterwards.
+    """
+    sourceDir = os.path.dirname(sourcePath)
+    if not sourceDir:
+        sourceDir = '.'
+    iniFileName = f'{appName}.ini'
+    iniFiles = [f'{installDir}/{iniFileName}', f'{sourceDir}/{iniFileName}']
+    config = merge_config(iniFiles, settings, options)
+    kwargs.update(config)
+    global _sharedConverter
+    if _sharedConverter is None:
+        _sharedConverter = Aeon2Converter()
+    _sharedConverter.ui = ui
+    _sharedConverter.newFile = None
+    _sharedConverter.run(sourcePath, **kwargs)
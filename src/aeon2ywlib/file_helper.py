@@ -0,0 +1,17 @@
+"""Provide a helper function for detecting file changes.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/aeon2yw
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+
+
+def get_file_stamp(filePath):
+    """Return a (modification time, size) tuple, or None if filePath cannot be accessed."""
+    try:
+        st = os.stat(filePath)
+    except OSError:
+        return None
+
+    return (st.st_mtime_ns, st.st_size)
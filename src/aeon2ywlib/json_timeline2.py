@@ -5,7 +5,10 @@ For further information see https://github.com/peter88213/aeon2yw
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 from datetime import datetime
+from datetime import date
 from datetime import timedelta
+from collections import defaultdict
+from sys import intern
 from pywriter.pywriter_globals import *
 from pywriter.model.chapter import Chapter
 from pywriter.model.scene import Scene
@@ -19,6 +22,31 @@ from aeon2ywlib.aeon2_fop import save_timeline
 from aeon2ywlib.uid_helper import get_uid
 from aeon2ywlib.moonphase import get_moon_phase_plus
 
+DATETIME_MIN = datetime.min
+# Origin of Aeon timestamps
+DESC_PROPERTY_FOUND = 1
+# Flag: the event has a description property
+NOTES_PROPERTY_FOUND = 2
+# Flag: the event has a notes property
+ALL_PROPERTIES_FOUND = DESC_PROPERTY_FOUND | NOTES_PROPERTY_FOUND
+
+
+def generate_ids(elements):
+    """Yield unused IDs for new elements, like repeated calls of create_id().
+    
+    Positional arguments:
+        elements -- list or dictionary containing all existing IDs
+
+    The search continues where the previous one stopped, so adding n 
+    elements does not rescan the taken IDs n times. 
+    This requires that no IDs are removed from elements in the meantime.
+    """
+    i = 1
+    while True:
+        while str(i) in elements:
+            i += 1
+        yield intern(str(i))
+
 
 class JsonTimeline2(File):
     """File representation of an Aeon Timeline 2 project. 
@@ -39,7 +67,7 @@ class JsonTimeline2(File):
     SUFFIX = ''
     VALUE_YES = '1'
     # JSON representation of "yes" in Aeon2 "yes/no" properties
-    DATE_LIMIT = (datetime(100, 1, 1) - datetime.min).total_seconds()
+    DATE_LIMIT = (datetime(100, 1, 1) - DATETIME_MIN).total_seconds()
     # Dates before 100-01-01 can not be displayed properly in yWriter
     PROPERTY_MOONPHASE = 'Moon phase'
 
@@ -130,9 +158,15 @@ class JsonTimeline2(File):
         self._characterGuidById = {}
         self._locationGuidById = {}
         self._itemGuidById = {}
-        self._trashEvents = []
+        self._trashEvents = set()
         self._arcGuidsByName = {}
 
+        # Initial values of the custom keyword variables
+        self._scnKwVarInit = dict.fromkeys(self.SCN_KWVAR)
+        self._crtKwVarInit = dict.fromkeys(self.CRT_KWVAR)
+        self._locKwVarInit = dict.fromkeys(self.LOC_KWVAR)
+        self._itmKwVarInit = dict.fromkeys(self.ITM_KWVAR)
+
     def read(self):
         """Parse the file and get the instance variables.
         
@@ -143,7 +177,50 @@ class JsonTimeline2(File):
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
+
+        def add_entity_type(typeKey, typeName, roleName, color, icon, persistent):
+            """Add an entity type with a single role to the template.
+            
+            Positional arguments:
+                typeKey: str -- Key for generating the type and role GUIDs.
+                typeName: str -- Name of the type.
+                roleName: str -- Name of the role.
+                color: str -- Type icon color.
+                icon: str -- Type icon.
+                persistent: bool -- True, if entities of the type persist over time.
+                
+            Return a tuple containing the GUIDs of the new type and role.
+            """
+            typeGuid = get_uid(f'_type{typeKey}Guid')
+            roleGuid = get_uid(f'_role{typeKey}Guid')
+            typeCount = len(tplTypes)
+            tplTypes.append(
+                {
+                    'color': color,
+                    'guid': typeGuid,
+                    'icon': icon,
+                    'name': typeName,
+                    'persistent': persistent,
+                    'roles': [
+                        {
+                            'allowsMultipleForEntity': True,
+                            'allowsMultipleForEvent': True,
+                            'allowsPercentAllocated': False,
+                            'guid': roleGuid,
+                            'icon': 'circle text',
+                            'mandatoryForEntity': False,
+                            'mandatoryForEvent': False,
+                            'name': roleName,
+                            'sortOrder': 0
+                        }
+                    ],
+                    'sortOrder': typeCount
+                })
+            return typeGuid, roleGuid
+
         self._jsonData = open_timeline(self.filePath)
+        tplTypes = self._jsonData['template']['types']
+        tplProperties = self._jsonData['template']['properties']
 
         #--- Get the color definitions.
         for tplCol in self._jsonData['template']['colors']:
@@ -161,8 +238,10 @@ class JsonTimeline2(File):
             raise Error(_('"AD" era is missing in the calendar.'))
 
         #--- Get GUID of user defined types and roles.
-        for tplTyp in self._jsonData['template']['types']:
+        arcType = None
+        for tplTyp in tplTypes:
             if tplTyp['name'] == 'Arc':
+                arcType = tplTyp
                 self._typeArcGuid = tplTyp['guid']
                 for tplTypRol in tplTyp['roles']:
                     if tplTypRol['name'] == 'Arc':
@@ -189,133 +268,62 @@ class JsonTimeline2(File):
                         break
 
         #--- Add "Arc" type, if missing.
-        if self._typeArcGuid is None:
+        if arcType is None:
             self._typeArcGuid = get_uid('typeArcGuid')
-            typeCount = len(self._jsonData['template']['types'])
-            self._jsonData['template']['types'].append(
+            typeCount = len(tplTypes)
+            arcType = {
+                'color': 'iconYellow',
+                'guid': self._typeArcGuid,
+                'icon': 'book',
+                'name': 'Arc',
+                'persistent': True,
+                'roles': [],
+                'sortOrder': typeCount
+            }
+            tplTypes.append(arcType)
+        if self._roleArcGuid is None:
+            self._roleArcGuid = get_uid('_roleArcGuid')
+            arcType['roles'].append(
                 {
-                    'color': 'iconYellow',
-                    'guid': self._typeArcGuid,
-                    'icon': 'book',
-                    'name': 'Arc',
-                    'persistent': True,
-                    'roles': [],
-                    'sortOrder': typeCount
+                'allowsMultipleForEntity': True,
+                'allowsMultipleForEvent': True,
+                'allowsPercentAllocated': False,
+                'guid': self._roleArcGuid,
+                'icon': 'circle text',
+                'mandatoryForEntity': False,
+                'mandatoryForEvent': False,
+                'name': 'Arc',
+                'sortOrder': 0
+                })
+        if self._roleStorylineGuid is None:
+            self._roleStorylineGuid = get_uid('_roleStorylineGuid')
+            arcType['roles'].append(
+                {
+                'allowsMultipleForEntity': True,
+                'allowsMultipleForEvent': True,
+                'allowsPercentAllocated': False,
+                'guid': self._roleStorylineGuid,
+                'icon': 'circle filled text',
+                'mandatoryForEntity': False,
+                'mandatoryForEvent': False,
+                'name': 'Storyline',
+                'sortOrder': 0
                 })
-        for entityType in self._jsonData['template']['types']:
-            if entityType['name'] == 'Arc':
-                if self._roleArcGuid is None:
-                    self._roleArcGuid = get_uid('_roleArcGuid')
-                    entityType['roles'].append(
-                        {
-                        'allowsMultipleForEntity': True,
-                        'allowsMultipleForEvent': True,
-                        'allowsPercentAllocated': False,
-                        'guid': self._roleArcGuid,
-                        'icon': 'circle text',
-                        'mandatoryForEntity': False,
-                        'mandatoryForEvent': False,
-                        'name': 'Arc',
-                        'sortOrder': 0
-                        })
-                if self._roleStorylineGuid is None:
-                    self._roleStorylineGuid = get_uid('_roleStorylineGuid')
-                    entityType['roles'].append(
-                        {
-                        'allowsMultipleForEntity': True,
-                        'allowsMultipleForEvent': True,
-                        'allowsPercentAllocated': False,
-                        'guid': self._roleStorylineGuid,
-                        'icon': 'circle filled text',
-                        'mandatoryForEntity': False,
-                        'mandatoryForEvent': False,
-                        'name': 'Storyline',
-                        'sortOrder': 0
-                        })
 
         #--- Add "Character" type, if missing.
         if self._typeCharacterGuid is None:
-            self._typeCharacterGuid = get_uid('_typeCharacterGuid')
-            self._roleCharacterGuid = get_uid('_roleCharacterGuid')
-            typeCount = len(self._jsonData['template']['types'])
-            self._jsonData['template']['types'].append(
-                {
-                    'color': 'iconRed',
-                    'guid': self._typeCharacterGuid,
-                    'icon': 'person',
-                    'name': self._typeCharacter,
-                    'persistent': False,
-                    'roles': [
-                        {
-                            'allowsMultipleForEntity': True,
-                            'allowsMultipleForEvent': True,
-                            'allowsPercentAllocated': False,
-                            'guid': self._roleCharacterGuid,
-                            'icon': 'circle text',
-                            'mandatoryForEntity': False,
-                            'mandatoryForEvent': False,
-                            'name': self._roleCharacter,
-                            'sortOrder': 0
-                        }
-                    ],
-                    'sortOrder': typeCount
-                })
+            self._typeCharacterGuid, self._roleCharacterGuid = add_entity_type(
+                'Character', self._typeCharacter, self._roleCharacter, 'iconRed', 'person', False)
 
         #--- Add "Location" type, if missing.
         if self._typeLocationGuid is None:
-            self._typeLocationGuid = get_uid('_typeLocationGuid')
-            self._roleLocationGuid = get_uid('_roleLocationGuid')
-            typeCount = len(self._jsonData['template']['types'])
-            self._jsonData['template']['types'].append(
-                {
-                    'color': 'iconOrange',
-                    'guid': self._typeLocationGuid,
-                    'icon': 'map',
-                    'name': self._typeLocation,
-                    'persistent': True,
-                    'roles': [
-                        {
-                            'allowsMultipleForEntity': True,
-                            'allowsMultipleForEvent': True,
-                            'allowsPercentAllocated': False,
-                            'guid': self._roleLocationGuid,
-                            'icon': 'circle text',
-                            'mandatoryForEntity': False,
-                            'mandatoryForEvent': False,
-                            'name': self._roleLocation,
-                            'sortOrder': 0
-                        }
-                    ],
-                    'sortOrder': typeCount
-                })
+            self._typeLocationGuid, self._roleLocationGuid = add_entity_type(
+                'Location', self._typeLocation, self._roleLocation, 'iconOrange', 'map', True)
 
         #--- Add "Item" type, if missing.
         if self._typeItemGuid is None:
-            self._typeItemGuid = get_uid('_typeItemGuid')
-            self._roleItemGuid = get_uid('_roleItemGuid')
-            typeCount = len(self._jsonData['template']['types'])
-            self._jsonData['template']['types'].append(
-                {
-                    'color': 'iconPurple',
-                    'guid': self._typeItemGuid,
-                    'icon': 'cube',
-                    'name': self._typeItem,
-                    'persistent': True,
-                    'roles': [
-                        {
-                            'allowsMultipleForEntity': True,
-                            'allowsMultipleForEvent': True,
-                            'allowsPercentAllocated': False,
-                            'guid': self._roleItemGuid,
-                            'icon': 'circle text',
-                            'mandatoryForEntity': False,
-                            'mandatoryForEvent': False,
-                            'name': self._roleItem,
-                            'sortOrder': 0
-                        }
-                    ],
-                    'sortOrder': typeCount
-                })
+            self._typeItemGuid, self._roleItemGuid = add_entity_type(
+                'Item', self._typeItem, self._roleItem, 'iconPurple', 'cube', True)
 
         #--- Get arcs, characters, locations, and items.
         # At the beginning, self.novel contains the  target data (if syncronizing an existing project),
@@ -324,8 +332,8 @@ class JsonTimeline2(File):
         # In order to reuse them, they are collected in the "target element ID by title" dictionaries.
 
         targetScIdByTitle = {}
-        for scId in self.novel.scenes:
-            title = self.novel.scenes[scId].title
+        for scId, scene in self.novel.scenes.items():
+            title = scene.title
             if title:
                 if title in targetScIdByTitle:
                     raise Error(_('Ambiguous yWriter scene title "{}".').format(title))
@@ -333,8 +341,8 @@ class JsonTimeline2(File):
                 targetScIdByTitle[title] = scId
 
         targetCrIdByTitle = {}
-        for crId in self.novel.characters:
-            title = self.novel.characters[crId].title
+        for crId, character in self.novel.characters.items():
+            title = character.title
             if title:
                 if title in targetCrIdByTitle:
                     raise Error(_('Ambiguous yWriter character "{}".').format(title))
@@ -342,8 +350,8 @@ class JsonTimeline2(File):
                 targetCrIdByTitle[title] = crId
 
         targetLcIdByTitle = {}
-        for lcId in self.novel.locations:
-            title = self.novel.locations[lcId].title
+        for lcId, location in self.novel.locations.items():
+            title = location.title
             if title:
                 if title in targetLcIdByTitle:
                     raise Error(_('Ambiguous yWriter location "{}".').format(title))
@@ -351,8 +359,8 @@ class JsonTimeline2(File):
                 targetLcIdByTitle[title] = lcId
 
         targetItIdByTitle = {}
-        for itId in self.novel.items:
-            title = self.novel.items[itId].title
+        for itId, item in self.novel.items.items():
+            title = item.title
             if title:
                 if title in targetItIdByTitle:
                     raise Error(_('Ambiguous yWriter item "{}".').format(title))
@@ -365,83 +373,106 @@ class JsonTimeline2(File):
         itIdsByGuid = {}
 
         # For ambiguity check:
-        characterNames = []
-        locationNames = []
-        itemNames = []
+        characterNames = set()
+        locationNames = set()
+        itemNames = set()
+
+        # For ID generation:
+        newCrIds = generate_ids(self.novel.characters)
+        newLcIds = generate_ids(self.novel.locations)
+        newItIds = generate_ids(self.novel.items)
+
+        # For entity type dispatch:
+        entityKinds = {
+            self._typeArcGuid: 'arc',
+            self._typeCharacterGuid: 'character',
+            self._typeLocationGuid: 'location',
+            self._typeItemGuid: 'item',
+            }
 
         for ent in self._jsonData['entities']:
-            if ent['entityType'] == self._typeArcGuid:
+            entityKind = entityKinds.get(ent['entityType'])
+            if entityKind is None:
+                continue
+
+            if entityKind == 'arc':
                 self._arcCount += 1
                 if ent['name'] == self._entityNarrative:
                     self._entityNarrativeGuid = ent['guid']
                 else:
                     self._arcGuidsByName[ent['name']] = ent['guid']
 
-            elif ent['entityType'] == self._typeCharacterGuid:
+            elif entityKind == 'character':
                 if ent['name'] in characterNames:
                     raise Error(_('Ambiguous Aeon character "{}".').format(ent['name']))
 
-                characterNames.append(ent['name'])
+                characterNames.add(ent['name'])
                 if ent['name'] in targetCrIdByTitle:
                     crId = targetCrIdByTitle[ent['name']]
+                    character = self.novel.characters[crId]
                 else:
-                    crId = create_id(self.novel.characters)
-                    self.novel.characters[crId] = Character()
-                    self.novel.characters[crId].title = ent['name']
+                    crId = next(newCrIds)
+                    character = Character()
+                    self.novel.characters[crId] = character
+                    character.title = ent['name']
                     self.novel.srtCharacters.append(crId)
                 crIdsByGuid[ent['guid']] = crId
                 self._characterGuidById[crId] = ent['guid']
                 if ent['notes']:
-                    self.novel.characters[crId].notes = ent['notes']
+                    character.notes = ent['notes']
                 else:
                     ent['notes'] = ''
 
                 #  Initialize custom keyword variables.
-                for fieldName in self.CRT_KWVAR:
-                    self.novel.characters[crId].kwVar[fieldName] = None
+                character.kwVar.update(self._crtKwVarInit)
 
-            elif ent['entityType'] == self._typeLocationGuid:
+            elif entityKind == 'location':
                 if ent['name'] in locationNames:
                     raise Error(_('Ambiguous Aeon location "{}".').format(ent['name']))
 
-                locationNames.append(ent['name'])
+                locationNames.add(ent['name'])
                 if ent['name'] in targetLcIdByTitle:
                     lcId = targetLcIdByTitle[ent['name']]
+                    location = self.novel.locations[lcId]
                 else:
-                    lcId = create_id(self.novel.locations)
-                    self.novel.locations[lcId] = WorldElement()
-                    self.novel.locations[lcId].title = ent['name']
+                    lcId = next(newLcIds)
+                    location = WorldElement()
+                    self.novel.locations[lcId] = location
+                    location.title = ent['name']
                     self.novel.srtLocations.append(lcId)
                 lcIdsByGuid[ent['guid']] = lcId
                 self._locationGuidById[lcId] = ent['guid']
 
                 # Initialize custom keyword variables.
-                for fieldName in self.LOC_KWVAR:
-                    self.novel.locations[lcId].kwVar[fieldName] = None
+                location.kwVar.update(self._locKwVarInit)
 
-            elif ent['entityType'] == self._typeItemGuid:
+            elif entityKind == 'item':
                 if ent['name'] in itemNames:
                     raise Error(_('Ambiguous Aeon item "{}".').format(ent['name']))
 
-                itemNames.append(ent['name'])
+                itemNames.add(ent['name'])
                 if ent['name'] in targetItIdByTitle:
                     itId = targetItIdByTitle[ent['name']]
+                    item = self.novel.items[itId]
                 else:
-                    itId = create_id(self.novel.items)
-                    self.novel.items[itId] = WorldElement()
-                    self.novel.items[itId].title = ent['name']
+                    itId = next(newItIds)
+                    item = WorldElement()
+                    self.novel.items[itId] = item
+                    item.title = ent['name']
                     self.novel.srtItems.append(itId)
                 itIdsByGuid[ent['guid']] = itId
                 self._itemGuidById[itId] = ent['guid']
 
                 # Initialize custom keyword variables.
-                for fieldName in self.ITM_KWVAR:
-                    self.novel.items[itId].kwVar[fieldName] = None
+                item.kwVar.update(self._itmKwVarInit)
+
+        # For scene arc lookup:
+        arcNameByGuid = {arcGuid: arcName for arcName, arcGuid in self._arcGuidsByName.items()}
 
         #--- Get GUID of user defined properties.
         hasPropertyNotes = False
         hasPropertyDesc = False
-        for tplPrp in self._jsonData['template']['properties']:
+        for tplPrp in tplProperties:
             if tplPrp['name'] == self._propertyDesc:
                 self._propertyDescGuid = tplPrp['guid']
                 hasPropertyDesc = True
@@ -453,10 +484,10 @@ class JsonTimeline2(File):
 
         #--- Create user defined properties, if missing.
         if not hasPropertyNotes:
-            for tplPrp in self._jsonData['template']['properties']:
+            for tplPrp in tplProperties:
                 tplPrp['sortOrder'] += 1
             self._propertyNotesGuid = get_uid('_propertyNotesGuid')
-            self._jsonData['template']['properties'].insert(0, {
+            tplProperties.insert(0, {
                 'calcMode': 'default',
                 'calculate': False,
                 'fadeEvents': False,
@@ -468,9 +499,9 @@ class JsonTimeline2(File):
                 'type': 'multitext'
             })
         if not hasPropertyDesc:
-            n = len(self._jsonData['template']['properties'])
+            n = len(tplProperties)
             self._propertyDescGuid = get_uid('_propertyDescGuid')
-            self._jsonData['template']['properties'].append({
+            tplProperties.append({
                 'calcMode': 'default',
                 'calculate': False,
                 'fadeEvents': False,
@@ -482,9 +513,9 @@ class JsonTimeline2(File):
                 'type': 'multitext'
             })
         if self._addMoonphase and self._propertyMoonphaseGuid is None:
-            n = len(self._jsonData['template']['properties'])
+            n = len(tplProperties)
             self._propertyMoonphaseGuid = get_uid('_propertyMoonphaseGuid')
-            self._jsonData['template']['properties'].append({
+            tplProperties.append({
                 'calcMode': 'default',
                 'calculate': False,
                 'fadeEvents': False,
@@ -496,194 +527,214 @@ class JsonTimeline2(File):
                 'type': 'text'
             })
 
+        # For event property dispatch:
+        propertyKinds = {
+            self._propertyDescGuid: 'desc',
+            self._propertyNotesGuid: 'notes',
+            }
+
+        # For scene relationship dispatch:
+        roleKinds = {
+            self._roleArcGuid: 'arc',
+            self._roleStorylineGuid: 'storyline',
+            self._roleCharacterGuid: 'character',
+            self._roleLocationGuid: 'location',
+            self._roleItemGuid: 'item',
+            }
+
+        # Local names for the event loop:
+        scenes = self.novel.scenes
+        scenesOnly = self._scenesOnly
+        roleArcGuid = self._roleArcGuid
+        narrativeGuid = self._entityNarrativeGuid
+        propertyDescGuid = self._propertyDescGuid
+        propertyNotesGuid = self._propertyNotesGuid
+        tplDateGuid = self._tplDateGuid
+        dateLimit = self.DATE_LIMIT
+        referenceDate = self.referenceDate
+        scnKwVarInit = self._scnKwVarInit
+        newScIds = generate_ids(scenes)
+
         #--- Update/create scenes.
-        scIdsByDate = {}
-        scnTitles = []
-        narrativeEvents = []
+        scIdsByDate = defaultdict(list)
+        scnTitles = set()
+        narrativeEvents = set()
         for evt in self._jsonData['events']:
 
             # Find out whether the event is associated to a normal scene:
             isNarrative = False
             for evtRel in evt['relationships']:
-                if evtRel['role'] == self._roleArcGuid:
-                    if self._entityNarrativeGuid and evtRel['entity'] == self._entityNarrativeGuid:
+                if evtRel['role'] == roleArcGuid:
+                    if narrativeGuid and evtRel['entity'] == narrativeGuid:
                         isNarrative = True
 
             if evt['title'] in scnTitles:
                 raise Error(f'Ambiguous Aeon event title "{evt["title"]}".')
 
             evt['title'] = evt['title'].strip()
-            scnTitles.append(evt['title'])
+            scnTitles.add(evt['title'])
             if evt['title'] in targetScIdByTitle:
                 scId = targetScIdByTitle[evt['title']]
+                scene = scenes[scId]
             else:
-                if self._scenesOnly and not isNarrative:
+                if scenesOnly and not isNarrative:
                     # don't create a "Notes" scene
                     continue
 
                 # Create a new scene.
-                scId = create_id(self.novel.scenes)
-                self.novel.scenes[scId] = Scene()
-                self.novel.scenes[scId].title = evt['title']
-                # print(f'read creates {self.novel.scenes[scId].title}')
-                self.novel.scenes[scId].status = 1
-
-            narrativeEvents.append(scId)
+                scId = next(newScIds)
+                scene = Scene()
+                scenes[scId] = scene
+                scene.title = evt['title']
+                # print(f'read creates {scene.title}')
+                scene.status = 1
+
+            narrativeEvents.add(scId)
             displayId = float(evt['displayId'])
             if displayId > self._displayIdMax:
                 self._displayIdMax = displayId
 
             #--- Initialize custom keyword variables.
-            for fieldName in self.SCN_KWVAR:
-                self.novel.scenes[scId].kwVar[fieldName] = self.novel.scenes[scId].kwVar.get(fieldName, None)
+            # Keep the values of an existing target scene.
+            scene.kwVar = {**scnKwVarInit, **scene.kwVar}
 
             #--- Evaluate properties.
-            hasDescription = False
-            hasNotes = False
+            foundProperties = 0
             for evtVal in evt['values']:
+                propertyKind = propertyKinds.get(evtVal['property'])
+                if propertyKind is None:
+                    continue
 
                 # Get scene description.
-                if evtVal['property'] == self._propertyDescGuid:
-                    hasDescription = True
+                if propertyKind == 'desc':
+                    foundProperties |= DESC_PROPERTY_FOUND
                     if evtVal['value']:
-                        self.novel.scenes[scId].desc = evtVal['value']
+                        scene.desc = evtVal['value']
 
                 # Get scene notes.
-                elif evtVal['property'] == self._propertyNotesGuid:
-                    hasNotes = True
+                elif propertyKind == 'notes':
+                    foundProperties |= NOTES_PROPERTY_FOUND
                     if evtVal['value']:
-                        self.novel.scenes[scId].notes = evtVal['value']
+                        scene.notes = evtVal['value']
 
             #--- Add description and scene notes, if missing.
-            if not hasDescription:
-                evt['values'].append({'property': self._propertyDescGuid, 'value': ''})
-            if not hasNotes:
-                evt['values'].append({'property': self._propertyNotesGuid, 'value': ''})
+            if foundProperties != ALL_PROPERTIES_FOUND:
+                if not foundProperties & DESC_PROPERTY_FOUND:
+                    evt['values'].append({'property': propertyDescGuid, 'value': ''})
+                if not foundProperties & NOTES_PROPERTY_FOUND:
+                    evt['values'].append({'property': propertyNotesGuid, 'value': ''})
 
             #--- Get scene tags.
             if evt['tags']:
-                self.novel.scenes[scId].tags = []
-                for evtTag in evt['tags']:
-                    self.novel.scenes[scId].tags.append(evtTag)
+                scene.tags = list(evt['tags'])
 
             #--- Get date/time/duration
             timestamp = 0
             for evtRgv in evt['rangeValues']:
-                if evtRgv['rangeProperty'] == self._tplDateGuid:
+                if evtRgv['rangeProperty'] == tplDateGuid:
                     timestamp = evtRgv['position']['timestamp']
-                    if timestamp >= self.DATE_LIMIT:
+                    if timestamp >= dateLimit:
                         # Restrict date/time calculation to dates within yWriter's range
-                        sceneStart = datetime.min + timedelta(seconds=timestamp)
-                        startDateTime = sceneStart.isoformat().split('T')
+                        sceneStart = DATETIME_MIN + timedelta(seconds=timestamp)
 
                         # Has the source an unspecific date?
-                        if self.novel.scenes[scId].day is not None:
+                        if scene.day is not None:
                             # Convert date to day.
-                            sceneDelta = sceneStart - self.referenceDate
-                            self.novel.scenes[scId].day = str(sceneDelta.days)
-                        elif (self.novel.scenes[scId].time is not None) and (self.novel.scenes[scId].date is None):
+                            sceneDelta = sceneStart - referenceDate
+                            scene.day = str(sceneDelta.days)
+                        elif (scene.time is not None) and (scene.date is None):
                             # Use the default date.
-                            self.novel.scenes[scId].day = '0'
+                            scene.day = '0'
                         else:
-                            self.novel.scenes[scId].date = startDateTime[0]
-                        self.novel.scenes[scId].time = startDateTime[1]
+                            scene.date = sceneStart.date().isoformat()
+                        scene.time = sceneStart.time().isoformat()
 
                         # Calculate duration
-                        if 'years' in evtRgv['span'] or 'months' in evtRgv['span']:
-                            endYear = sceneStart.year
-                            endMonth = sceneStart.month
-                            if 'years' in evtRgv['span']:
-                                endYear += evtRgv['span']['years']
-                            if 'months' in evtRgv['span']:
-                                endMonth += evtRgv['span']['months']
-                                while endMonth > 12:
-                                    endMonth -= 12
-                                    endYear += 1
-                            sceneEnd = datetime(endYear, endMonth, sceneStart.day)
-                            sceneDuration = sceneEnd - datetime(sceneStart.year, sceneStart.month, sceneStart.day)
-                            lastsDays = sceneDuration.days
-                            lastsHours = sceneDuration.seconds // 3600
-                            lastsMinutes = (sceneDuration.seconds % 3600) // 60
+                        span = evtRgv['span']
+                        if span:
+                            spanYears = span.get('years', 0)
+                            spanMonths = span.get('months', 0)
+                            if spanYears or spanMonths:
+                                extraYears, endMonth = divmod(sceneStart.month + spanMonths - 1, 12)
+                                endMonth += 1
+                                endYear = sceneStart.year + spanYears + extraYears
+                                # Both ends are at midnight, so the difference is whole days.
+                                lastsDays = date(endYear, endMonth, sceneStart.day).toordinal() - sceneStart.toordinal()
+                            else:
+                                lastsDays = 0
+                            spanMinutes = ((span.get('weeks', 0) * 7 + span.get('days', 0)) * 24
+                                           + span.get('hours', 0)) * 60 + span.get('minutes', 0) + span.get('seconds', 0) // 60
+                            spanDays, spanMinutes = divmod(spanMinutes, 1440)
+                            lastsDays += spanDays
+                            lastsHours, lastsMinutes = divmod(spanMinutes, 60)
                         else:
+                            # Point in time
                             lastsDays = 0
                             lastsHours = 0
                             lastsMinutes = 0
-                        if 'weeks' in evtRgv['span']:
-                            lastsDays += evtRgv['span']['weeks'] * 7
-                        if 'days' in evtRgv['span']:
-                            lastsDays += evtRgv['span']['days']
-                        if 'hours' in evtRgv['span']:
-                            lastsDays += evtRgv['span']['hours'] // 24
-                            lastsHours += evtRgv['span']['hours'] % 24
-                        if 'minutes' in evtRgv['span']:
-                            lastsHours += evtRgv['span']['minutes'] // 60
-                            lastsMinutes += evtRgv['span']['minutes'] % 60
-                        if 'seconds' in evtRgv['span']:
-                            lastsMinutes += evtRgv['span']['seconds'] // 60
-                        lastsHours += lastsMinutes // 60
-                        lastsMinutes %= 60
-                        lastsDays += lastsHours // 24
-                        lastsHours %= 24
-                        self.novel.scenes[scId].lastsDays = str(lastsDays)
-                        self.novel.scenes[scId].lastsHours = str(lastsHours)
-                        self.novel.scenes[scId].lastsMinutes = str(lastsMinutes)
+                        scene.lastsDays = str(lastsDays)
+                        scene.lastsHours = str(lastsHours)
+                        scene.lastsMinutes = str(lastsMinutes)
                     break
 
             # Use the timestamp for chronological sorting.
-            if not timestamp in scIdsByDate:
-                scIdsByDate[timestamp] = []
             scIdsByDate[timestamp].append(scId)
 
             #--- Find scenes and get characters, locations, and items.
-            self.novel.scenes[scId].scType = 1
+            scene.scType = 1
             # type = "Notes"
-            self.novel.scenes[scId].characters = None
-            self.novel.scenes[scId].locations = None
-            self.novel.scenes[scId].items = None
+            characters = []
+            locations = []
+            items = []
             scnArcs = []
             for evtRel in evt['relationships']:
-                if evtRel['role'] == self._roleArcGuid:
+                roleKind = roleKinds.get(evtRel['role'])
+                if roleKind is None:
+                    continue
+
+                if roleKind == 'arc':
                     # Make scene event "Normal" type scene.
-                    if self._entityNarrativeGuid and evtRel['entity'] == self._entityNarrativeGuid:
-                        self.novel.scenes[scId].scType = 0
+                    if narrativeGuid and evtRel['entity'] == narrativeGuid:
+                        scene.scType = 0
                         # type = "Normal"
                         if timestamp > self._timestampMax:
                             self._timestampMax = timestamp
-                if evtRel['role'] == self._roleStorylineGuid:
+                elif roleKind == 'storyline':
                     # Collect scene arcs.
-                    for arcName in self._arcGuidsByName:
-                        if evtRel['entity'] == self._arcGuidsByName[arcName]:
-                            scnArcs.append(arcName)
-                elif evtRel['role'] == self._roleCharacterGuid:
-                    if self.novel.scenes[scId].characters is None:
-                        self.novel.scenes[scId].characters = []
-                    crId = crIdsByGuid[evtRel['entity']]
-                    self.novel.scenes[scId].characters.append(crId)
-                elif evtRel['role'] == self._roleLocationGuid:
-                    if self.novel.scenes[scId].locations is None:
-                        self.novel.scenes[scId].locations = []
-                    lcId = lcIdsByGuid[evtRel['entity']]
-                    self.novel.scenes[scId].locations.append(lcId)
-                elif evtRel['role'] == self._roleItemGuid:
-                    if self.novel.scenes[scId].items is None:
-                        self.novel.scenes[scId].items = []
-                    itId = itIdsByGuid[evtRel['entity']]
-                    self.novel.scenes[scId].items.append(itId)
+                    arcName = arcNameByGuid.get(evtRel['entity'])
+                    if arcName is not None:
+                        scnArcs.append(arcName)
+                elif roleKind == 'character':
+                    characters.append(crIdsByGuid[evtRel['entity']])
+                elif roleKind == 'location':
+                    locations.append(lcIdsByGuid[evtRel['entity']])
+                elif roleKind == 'item':
+                    items.append(itIdsByGuid[evtRel['entity']])
+
+            # Scenes without relationships of a kind have None instead of an empty list.
+            scene.characters = characters or None
+            scene.locations = locations or None
+            scene.items = items or None
 
             # Add arcs to the scene keyword variables.
-            self.novel.scenes[scId].scnArcs = list_to_string(scnArcs)
+            if not scnArcs:
+                scene.scnArcs = ''
+            elif len(scnArcs) == 1:
+                scene.scnArcs = scnArcs[0]
+            else:
+                scene.scnArcs = list_to_string(scnArcs)
 
         #--- Mark scenes deleted in Aeon "Unused".
-        for scId in self.novel.scenes:
+        for scId, scene in self.novel.scenes.items():
             if not scId in narrativeEvents:
-                if self.novel.scenes[scId].scType == 0:
-                    self.novel.scenes[scId].scType = 3
+                if scene.scType == 0:
+                    scene.scType = 3
 
         #--- Make sure every scene is assigned to a chapter.
-        scenesInChapters = []
+        scenesInChapters = set()
         # List all scenes already assigned to a chapter.
         for chId in self.novel.srtChapters:
-            scenesInChapters.extend(self.novel.chapters[chId].srtScenes)
+            scenesInChapters.update(self.novel.chapters[chId].srtScenes)
 
         # Create a chapter for new scenes.
         newChapterId = create_id(self.novel.srtChapters)
@@ -692,9 +743,8 @@ class JsonTimeline2(File):
         newChapter.chType = 0
 
         # Sort scenes by date/time, then put the orphaned ones into the new chapter.
-        srtScenes = sorted(scIdsByDate.items())
-        for __, scList in srtScenes:
-            for scId in scList:
+        for timestamp in sorted(scIdsByDate):
+            for scId in scIdsByDate[timestamp]:
                 if not scId in scenesInChapters:
                     if not newChapterId in self.novel.srtChapters:
                         self.novel.chapters[newChapterId] = newChapter
@@ -702,7 +752,7 @@ class JsonTimeline2(File):
                     self.novel.chapters[newChapterId].srtScenes.append(scId)
 
         if self._timestampMax == 0:
-            self._timestampMax = (self.referenceDate - datetime.min).total_seconds()
+            self._timestampMax = (self.referenceDate - DATETIME_MIN).total_seconds()
 
     def write(self):
         """Write instance variables to the file.
@@ -726,7 +776,7 @@ class JsonTimeline2(File):
                     isoDt = scene.date
                     if scene.time:
                         isoDt = (f'{isoDt} {scene.time}')
-                timestamp = int((datetime.fromisoformat(isoDt) - datetime.min).total_seconds())
+                timestamp = int((datetime.fromisoformat(isoDt) - DATETIME_MIN).total_seconds())
             except:
                 pass
             return timestamp
@@ -796,135 +846,138 @@ class JsonTimeline2(File):
         self.read()
         # create a new target novel from the aeon2 project file
 
-        targetEvents = []
-        for evt in self._jsonData['events']:
-            targetEvents.append(evt['title'])
+        targetEvents = {evt['title'] for evt in self._jsonData['events']}
 
-        linkedCharacters = []
-        linkedLocations = []
-        linkedItems = []
+        linkedCharacters = set()
+        linkedLocations = set()
+        linkedItems = set()
+        # IDs of the source entities assigned to at least one source scene.
+        # Sets, because they are probed once per source entity below.
 
         #--- Check the source for ambiguous titles.
         # Check scenes.
-        srcScnTitles = []
-        for chId in source.chapters:
-            if source.chapters[chId].isTrash:
+        srcScnTitles = set()
+        for chapter in source.chapters.values():
+            if chapter.isTrash:
                 continue
 
-            for scId in source.chapters[chId].srtScenes:
-                if source.scenes[scId].title in srcScnTitles:
-                    raise Error(_('Ambiguous yWriter scene title "{}".').format(source.scenes[scId].title))
+            for scId in chapter.srtScenes:
+                srcScene = source.scenes[scId]
+                if srcScene.title in srcScnTitles:
+                    raise Error(_('Ambiguous yWriter scene title "{}".').format(srcScene.title))
 
-                srcScnTitles.append(source.scenes[scId].title)
+                srcScnTitles.add(srcScene.title)
 
                 #--- Collect characters, locations, and items assigned to scenes.
-                if source.scenes[scId].characters:
-                    linkedCharacters = list(set(linkedCharacters + source.scenes[scId].characters))
-                if source.scenes[scId].locations:
-                    linkedLocations = list(set(linkedLocations + source.scenes[scId].locations))
-                if source.scenes[scId].items:
-                    linkedItems = list(set(linkedItems + source.scenes[scId].items))
+                if srcScene.characters:
+                    linkedCharacters.update(srcScene.characters)
+                if srcScene.locations:
+                    linkedLocations.update(srcScene.locations)
+                if srcScene.items:
+                    linkedItems.update(srcScene.items)
 
                 #--- Collect arcs from source.
-                arcs = string_to_list(source.scenes[scId].scnArcs)
-                for arc in arcs:
-                    if not arc in self._arcGuidsByName:
-                        self._arcGuidsByName[arc] = None
+                if srcScene.scnArcs:
+                    for arc in string_to_list(srcScene.scnArcs):
+                        self._arcGuidsByName.setdefault(arc, None)
                         # new arc; GUID is generated on writing
 
         # Check characters.
-        srcChrNames = []
-        for crId in source.characters:
+        srcChrNames = set()
+        for crId, character in source.characters.items():
             if not crId in linkedCharacters:
                 continue
 
-            if source.characters[crId].title in srcChrNames:
-                raise Error(_('Ambiguous yWriter character "{}".').format(source.characters[crId].title))
+            if character.title in srcChrNames:
+                raise Error(_('Ambiguous yWriter character "{}".').format(character.title))
 
-            srcChrNames.append(source.characters[crId].title)
+            srcChrNames.add(character.title)
 
         # Check locations.
-        srcLocTitles = []
-        for lcId in source.locations:
+        srcLocTitles = set()
+        for lcId, location in source.locations.items():
             if not lcId in linkedLocations:
                 continue
 
-            if source.locations[lcId].title in srcLocTitles:
-                raise Error(_('Ambiguous yWriter location "{}".').format(source.locations[lcId].title))
+            if location.title in srcLocTitles:
+                raise Error(_('Ambiguous yWriter location "{}".').format(location.title))
 
-            srcLocTitles.append(source.locations[lcId].title)
+            srcLocTitles.add(location.title)
 
         # Check items.
-        srcItmTitles = []
-        for itId in source.items:
+        srcItmTitles = set()
+        for itId, item in source.items.items():
             if not itId in linkedItems:
                 continue
 
-            if source.items[itId].title in srcItmTitles:
-                raise Error(_('Ambiguous yWriter item "{}".').format(source.items[itId].title))
+            if item.title in srcItmTitles:
+                raise Error(_('Ambiguous yWriter item "{}".').format(item.title))
 
-            srcItmTitles.append(source.items[itId].title)
+            srcItmTitles.add(item.title)
 
         #--- Check the target for ambiguous titles.
         # Check scenes.
         scIdsByTitle = {}
-        for scId in self.novel.scenes:
-            if self.novel.scenes[scId].title in scIdsByTitle:
-                raise Error(_('Ambiguous Aeon event title "{}".').format(self.novel.scenes[scId].title))
+        for scId, scene in self.novel.scenes.items():
+            if scene.title in scIdsByTitle:
+                raise Error(_('Ambiguous Aeon event title "{}".').format(scene.title))
 
-            scIdsByTitle[self.novel.scenes[scId].title] = scId
-            # print(f'merge finds {self.novel.scenes[scId].title}')
+            scIdsByTitle[scene.title] = scId
+            # print(f'merge finds {scene.title}')
 
             #--- Mark non-scene events.
             # This is to recognize "Trash" scenes.
-            if not self.novel.scenes[scId].title in srcScnTitles:
-                if not self.novel.scenes[scId].scType == 1:
-                    self._trashEvents.append(scId)
+            if not scene.title in srcScnTitles:
+                if not scene.scType == 1:
+                    self._trashEvents.add(scId)
 
         # Check characters.
         crIdsByTitle = {}
-        for crId in self.novel.characters:
-            if self.novel.characters[crId].title in crIdsByTitle:
-                raise Error(_('Ambiguous Aeon character "{}".').format(self.novel.characters[crId].title))
+        for crId, character in self.novel.characters.items():
+            if character.title in crIdsByTitle:
+                raise Error(_('Ambiguous Aeon character "{}".').format(character.title))
 
-            crIdsByTitle[self.novel.characters[crId].title] = crId
+            crIdsByTitle[character.title] = crId
 
         # Check locations.
         lcIdsByTitle = {}
-        for lcId in self.novel.locations:
-            if self.novel.locations[lcId].title in lcIdsByTitle:
-                raise Error(_('Ambiguous Aeon location "{}".').format(self.novel.locations[lcId].title))
+        for lcId, location in self.novel.locations.items():
+            if location.title in lcIdsByTitle:
+                raise Error(_('Ambiguous Aeon location "{}".').format(location.title))
 
-            lcIdsByTitle[self.novel.locations[lcId].title] = lcId
+            lcIdsByTitle[location.title] = lcId
 
         # Check items.
         itIdsByTitle = {}
-        for itId in self.novel.items:
-            if self.novel.items[itId].title in itIdsByTitle:
-                raise Error(_('Ambiguous Aeon item "{}".').format(self.novel.items[itId].title))
+        for itId, item in self.novel.items.items():
+            if item.title in itIdsByTitle:
+                raise Error(_('Ambiguous Aeon item "{}".').format(item.title))
 
-            itIdsByTitle[self.novel.items[itId].title] = itId
+            itIdsByTitle[item.title] = itId
 
         #--- Update characters from the source.
+        newEntities = []
+        # Entities to be added to the timeline
         crIdMax = len(self.novel.characters)
         crIdsBySrcId = {}
-        for srcCrId in source.characters:
-            if source.characters[srcCrId].title in crIdsByTitle:
-                crIdsBySrcId[srcCrId] = crIdsByTitle[source.characters[srcCrId].title]
+        for srcCrId, srcCharacter in source.characters.items():
+            crId = crIdsByTitle.get(srcCharacter.title)
+            if crId is not None:
+                crIdsBySrcId[srcCrId] = crId
             elif srcCrId in linkedCharacters:
                 #--- Create a new character if it is assigned to at least one scene.
                 crIdMax += 1
                 crId = str(crIdMax)
                 crIdsBySrcId[srcCrId] = crId
-                self.novel.characters[crId] = source.characters[srcCrId]
-                newGuid = get_uid(f'{crId}{self.novel.characters[crId].title}')
+                self.novel.characters[crId] = srcCharacter
+                newGuid = get_uid(f'{crId}{srcCharacter.title}')
                 self._characterGuidById[crId] = newGuid
-                self._jsonData['entities'].append(
+                newEntities.append(
                     {
                         'entityType': self._typeCharacterGuid,
                         'guid': newGuid,
                         'icon': 'person',
-                        'name': self.novel.characters[crId].title,
+                        'name': srcCharacter.title,
                         'notes': '',
                         'sortOrder': crIdMax - 1,
                         'swatchColor': 'darkPink'
@@ -933,23 +986,24 @@ class JsonTimeline2(File):
         #--- Update locations from the source.
         lcIdMax = len(self.novel.locations)
         lcIdsBySrcId = {}
-        for srcLcId in source.locations:
-            if source.locations[srcLcId].title in lcIdsByTitle:
-                lcIdsBySrcId[srcLcId] = lcIdsByTitle[source.locations[srcLcId].title]
+        for srcLcId, srcLocation in source.locations.items():
+            lcId = lcIdsByTitle.get(srcLocation.title)
+            if lcId is not None:
+                lcIdsBySrcId[srcLcId] = lcId
             elif srcLcId in linkedLocations:
                 #--- Create a new location if it is assigned to at least one scene.
                 lcIdMax += 1
                 lcId = str(lcIdMax)
                 lcIdsBySrcId[srcLcId] = lcId
-                self.novel.locations[lcId] = source.locations[srcLcId]
-                newGuid = get_uid(f'{lcId}{self.novel.locations[lcId].title}')
+                self.novel.locations[lcId] = srcLocation
+                newGuid = get_uid(f'{lcId}{srcLocation.title}')
                 self._locationGuidById[lcId] = newGuid
-                self._jsonData['entities'].append(
+                newEntities.append(
                     {
                         'entityType': self._typeLocationGuid,
                         'guid': newGuid,
                         'icon': 'map',
-                        'name': self.novel.locations[lcId].title,
+                        'name': srcLocation.title,
                         'notes': '',
                         'sortOrder': lcIdMax - 1,
                         'swatchColor': 'orange'
@@ -958,56 +1012,52 @@ class JsonTimeline2(File):
         #--- Update Items from the source.
         itIdMax = len(self.novel.items)
         itIdsBySrcId = {}
-        for srcItId in source.items:
-            if source.items[srcItId].title in itIdsByTitle:
-                itIdsBySrcId[srcItId] = itIdsByTitle[source.items[srcItId].title]
+        for srcItId, srcItem in source.items.items():
+            itId = itIdsByTitle.get(srcItem.title)
+            if itId is not None:
+                itIdsBySrcId[srcItId] = itId
             elif srcItId in linkedItems:
                 #--- Create a new Item if it is assigned to at least one scene.
                 itIdMax += 1
                 itId = str(itIdMax)
                 itIdsBySrcId[srcItId] = itId
-                self.novel.items[itId] = source.items[srcItId]
-                newGuid = get_uid(f'{itId}{self.novel.items[itId].title}')
+                self.novel.items[itId] = srcItem
+                newGuid = get_uid(f'{itId}{srcItem.title}')
                 self._itemGuidById[itId] = newGuid
-                self._jsonData['entities'].append(
+                newEntities.append(
                     {
                         'entityType': self._typeItemGuid,
                         'guid': newGuid,
                         'icon': 'cube',
-                        'name': self.novel.items[itId].title,
+                        'name': srcItem.title,
                         'notes': '',
                         'sortOrder': itIdMax - 1,
                         'swatchColor': 'denim'
                     })
 
+        #--- Add the new characters, locations, and items to the timeline.
+        self._jsonData['entities'].extend(newEntities)
+
         #--- Update scenes from the source.
         totalEvents = len(self._jsonData['events'])
-        for chId in source.chapters:
-            for srcId in source.chapters[chId].srtScenes:
-                if source.scenes[srcId].scType == 3:
-                    # Remove unused scene from the "Narrative" arc.
-                    if source.scenes[srcId].title in scIdsByTitle:
-                        scId = scIdsByTitle[source.scenes[srcId].title]
+        scenesOnly = self._scenesOnly
+        for chapter in source.chapters.values():
+            for srcId in chapter.srtScenes:
+                srcScene = source.scenes[srcId]
+                srcScType = srcScene.scType
+                scId = scIdsByTitle.get(srcScene.title)
+                if (srcScType == 3
+                        or (srcScType == 1 and scenesOnly)
+                        or (srcScType == 2 and srcScene.scnArcs is None)):
+                    # Remove unused scene, unsynchronized scene,
+                    # or "non-point" Todo scene from the "Narrative" arc.
+                    if scId is not None:
                         self.novel.scenes[scId].scType = 1
                     continue
 
-                if source.scenes[srcId].scType == 1 and self._scenesOnly:
-                    # Remove unsynchronized scene from the "Narrative" arc.
-                    if source.scenes[srcId].title in scIdsByTitle:
-                        scId = scIdsByTitle[source.scenes[srcId].title]
-                        self.novel.scenes[scId].scType = 1
-                    continue
-
-                if source.scenes[srcId].scType == 2 and source.scenes[srcId].scnArcs is None:
-                    # Remove "non-point" Todo scene from the "Narrative" arc.
-                    if source.scenes[srcId].title in scIdsByTitle:
-                        scId = scIdsByTitle[source.scenes[srcId].title]
-                        self.novel.scenes[scId].scType = 1
-                    continue
-
-                if source.scenes[srcId].title in scIdsByTitle:
-                    scId = scIdsByTitle[source.scenes[srcId].title]
-                elif source.scenes[srcId].title in targetEvents:
+                if scId is not None:
+                    tgtScene = self.novel.scenes[scId]
+                elif srcScene.title in targetEvents:
                     # catch non-narrative events in the target
                     continue
 
@@ -1015,79 +1065,79 @@ class JsonTimeline2(File):
                     #--- Create a new scene.
                     totalEvents += 1
                     scId = str(totalEvents)
-                    self.novel.scenes[scId] = Scene()
-                    self.novel.scenes[scId].title = source.scenes[srcId].title
-                    # print(f'merge creates {self.novel.scenes[scId].title}')
-                    scIdsByTitle[self.novel.scenes[scId].title] = scId
-                    self.novel.scenes[scId].scType = source.scenes[srcId].scType
-                    newEvent = build_event(self.novel.scenes[scId])
+                    tgtScene = Scene()
+                    self.novel.scenes[scId] = tgtScene
+                    tgtScene.title = srcScene.title
+                    # print(f'merge creates {tgtScene.title}')
+                    scIdsByTitle[tgtScene.title] = scId
+                    tgtScene.scType = srcScene.scType
+                    newEvent = build_event(tgtScene)
                     self._jsonData['events'].append(newEvent)
-                self.novel.scenes[scId].status = source.scenes[srcId].status
+                tgtScene.status = srcScene.status
 
                 #--- Update scene type.
-                if source.scenes[srcId].scType is not None:
-                    self.novel.scenes[scId].scType = source.scenes[srcId].scType
+                if srcScene.scType is not None:
+                    tgtScene.scType = srcScene.scType
 
                 #--- Update scene tags.
-                if source.scenes[srcId].tags is not None:
-                    self.novel.scenes[scId].tags = source.scenes[srcId].tags
+                if srcScene.tags is not None:
+                    tgtScene.tags = srcScene.tags
 
                 #--- Update scene description.
-                if source.scenes[srcId].desc is not None:
-                    self.novel.scenes[scId].desc = source.scenes[srcId].desc
+                if srcScene.desc is not None:
+                    tgtScene.desc = srcScene.desc
 
                 #--- Update scene characters.
-                if source.scenes[srcId].characters is not None:
-                    self.novel.scenes[scId].characters = []
-                    for crId in source.scenes[srcId].characters:
+                if srcScene.characters is not None:
+                    tgtScene.characters = []
+                    for crId in srcScene.characters:
                         if crId in crIdsBySrcId:
-                            self.novel.scenes[scId].characters.append(crIdsBySrcId[crId])
+                            tgtScene.characters.append(crIdsBySrcId[crId])
 
                 #--- Update scene locations.
-                if source.scenes[srcId].locations is not None:
-                    self.novel.scenes[scId].locations = []
-                    for lcId in source.scenes[srcId].locations:
+                if srcScene.locations is not None:
+                    tgtScene.locations = []
+                    for lcId in srcScene.locations:
                         if lcId in lcIdsBySrcId:
-                            self.novel.scenes[scId].locations.append(lcIdsBySrcId[lcId])
+                            tgtScene.locations.append(lcIdsBySrcId[lcId])
 
                 #--- Update scene items.
-                if source.scenes[srcId].items is not None:
-                    self.novel.scenes[scId].items = []
-                    for itId in source.scenes[srcId].items:
+                if srcScene.items is not None:
+                    tgtScene.items = []
+                    for itId in srcScene.items:
                         if itId in itIdsBySrcId:
-                            self.novel.scenes[scId].items.append(itIdsBySrcId[itId])
+                            tgtScene.items.append(itIdsBySrcId[itId])
 
                 #--- Update scene arcs.
-                self.novel.scenes[scId].scnArcs = source.scenes[srcId].scnArcs
+                tgtScene.scnArcs = srcScene.scnArcs
 
                 #--- Update scene start date/time.
-                if source.scenes[srcId].time is not None:
-                    self.novel.scenes[scId].time = source.scenes[srcId].time
+                if srcScene.time is not None:
+                    tgtScene.time = srcScene.time
 
                 #--- Calculate event date from unspecific scene date, if any:
-                if source.scenes[srcId].day is not None:
-                    dayInt = int(source.scenes[srcId].day)
+                if srcScene.day is not None:
+                    dayInt = int(srcScene.day)
                     sceneDelta = timedelta(days=dayInt)
-                    self.novel.scenes[scId].date = (self.referenceDate + sceneDelta).isoformat().split('T')[0]
-                elif (source.scenes[srcId].date is None) and (source.scenes[srcId].time is not None):
-                    self.novel.scenes[scId].date = self.referenceDate.isoformat().split('T')[0]
+                    tgtScene.date = (self.referenceDate + sceneDelta).isoformat().split('T')[0]
+                elif (srcScene.date is None) and (srcScene.time is not None):
+                    tgtScene.date = self.referenceDate.isoformat().split('T')[0]
                 else:
-                    self.novel.scenes[scId].date = source.scenes[srcId].date
+                    tgtScene.date = srcScene.date
 
                 #--- Update scene duration.
-                if source.scenes[srcId].lastsMinutes is not None:
-                    self.novel.scenes[scId].lastsMinutes = source.scenes[srcId].lastsMinutes
-                if source.scenes[srcId].lastsHours is not None:
-                    self.novel.scenes[scId].lastsHours = source.scenes[srcId].lastsHours
-                if source.scenes[srcId].lastsDays is not None:
-                    self.novel.scenes[scId].lastsDays = source.scenes[srcId].lastsDays
+                if srcScene.lastsMinutes is not None:
+                    tgtScene.lastsMinutes = srcScene.lastsMinutes
+                if srcScene.lastsHours is not None:
+                    tgtScene.lastsHours = srcScene.lastsHours
+                if srcScene.lastsDays is not None:
+                    tgtScene.lastsDays = srcScene.lastsDays
 
                 #--- Update scene keyword variables.
+                srcKwVar = srcScene.kwVar
                 for fieldName in self.SCN_KWVAR:
-                    try:
-                        self.novel.scenes[scId].kwVar[fieldName] = source.scenes[srcId].kwVar[fieldName]
-                    except:
-                        pass
+                    if fieldName in srcKwVar:
+                        tgtScene.kwVar[fieldName] = srcKwVar[fieldName]
 
         #--- Begin writing
 
@@ -1110,17 +1160,19 @@ class JsonTimeline2(File):
             'percentAllocated': 1,
             'role': self._roleArcGuid,
         }
+        narrativeKey = (self._entityNarrativeGuid, self._roleArcGuid)
 
         #--- Add missing arcs.
         arcs = {}
-        for arcName in self._arcGuidsByName:
-            if self._arcGuidsByName[arcName] is None:
-                guid = get_uid(f'entity{arcName}ArcGuid')
-                self._arcGuidsByName[arcName] = guid
+        arcKeys = {}
+        for arcName, arcGuid in self._arcGuidsByName.items():
+            if arcGuid is None:
+                arcGuid = get_uid(f'entity{arcName}ArcGuid')
+                self._arcGuidsByName[arcName] = arcGuid
                 self._jsonData['entities'].append(
                     {
                         'entityType': self._typeArcGuid,
-                        'guid': guid,
+                        'guid': arcGuid,
                         'icon': 'book',
                         'name': arcName,
                         'notes': '',
@@ -1129,155 +1181,164 @@ class JsonTimeline2(File):
                     })
                 self._arcCount += 1
             arcs[arcName] = {
-                'entity': self._arcGuidsByName[arcName],
+                'entity': arcGuid,
                 'percentAllocated': 1,
                 'role': self._roleStorylineGuid,
             }
+            arcKeys[arcName] = (arcGuid, self._roleStorylineGuid)
+
+        # For event property dispatch:
+        propertyKinds = {
+            self._propertyDescGuid: 'desc',
+            self._propertyNotesGuid: 'notes',
+            }
+        if self._propertyMoonphaseGuid is not None:
+            propertyKinds[self._propertyMoonphaseGuid] = 'moon'
+
+        # Local names for the event loop:
+        getSpan = get_span
+        getTimestamp = get_timestamp
+        getMoonphase = get_moon_phase_plus
+        dateLimit = self.DATE_LIMIT
+        moonphaseGuid = self._propertyMoonphaseGuid
+        roleCharacterGuid = self._roleCharacterGuid
+        roleLocationGuid = self._roleLocationGuid
+        roleItemGuid = self._roleItemGuid
+        characterGuidById = self._characterGuidById
+        locationGuidById = self._locationGuidById
+        itemGuidById = self._itemGuidById
+        entityRoles = {roleCharacterGuid, roleLocationGuid, roleItemGuid}
+        # Roles of the relationships rebuilt from the scene's characters, locations, and items
+        moonphases = {}
+        # Moon phase display strings by scene date; many scenes share a date.
 
         #--- Update events from scenes.
         for evt in self._jsonData['events']:
-            try:
-                scId = scIdsByTitle[evt['title']]
-            except KeyError:
+            scId = scIdsByTitle.get(evt['title'])
+            if scId is None:
                 continue
 
+            scene = self.novel.scenes[scId]
+
             #--- Set event date/time/span.
-            if evt['rangeValues'][0]['position']['timestamp'] >= self.DATE_LIMIT:
-                evt['rangeValues'][0]['span'] = get_span(self.novel.scenes[scId])
-                evt['rangeValues'][0]['position']['timestamp'] = get_timestamp(self.novel.scenes[scId])
+            evtRgv = evt['rangeValues'][0]
+            if evtRgv['position']['timestamp'] >= dateLimit:
+                evtRgv['span'] = getSpan(scene)
+                evtRgv['position']['timestamp'] = getTimestamp(scene)
 
             #--- Calculate moon phase.
-            if self._propertyMoonphaseGuid is not None:
-                eventMoonphase = get_moon_phase_plus(self.novel.scenes[scId].date)
+            if moonphaseGuid is not None:
+                eventMoonphase = moonphases.get(scene.date)
+                if eventMoonphase is None:
+                    eventMoonphase = getMoonphase(scene.date)
+                    moonphases[scene.date] = eventMoonphase
             else:
                 eventMoonphase = ''
 
             #--- Set scene description, notes, and moon phase.
             hasMoonphase = False
             for evtVal in evt['values']:
+                propertyKind = propertyKinds.get(evtVal['property'])
+                if propertyKind is None:
+                    continue
 
                 # Set scene description.
-                if evtVal['property'] == self._propertyDescGuid:
-                    if self.novel.scenes[scId].desc:
-                        evtVal['value'] = self.novel.scenes[scId].desc
+                if propertyKind == 'desc':
+                    if scene.desc:
+                        evtVal['value'] = scene.desc
 
                 # Set scene notes.
-                elif evtVal['property'] == self._propertyNotesGuid:
-                    if self.novel.scenes[scId].notes:
-                        evtVal['value'] = self.novel.scenes[scId].notes
+                elif propertyKind == 'notes':
+                    if scene.notes:
+                        evtVal['value'] = scene.notes
 
                 # Set moon phase.
-                elif evtVal['property'] == self._propertyMoonphaseGuid:
-                        evtVal['value'] = eventMoonphase
-                        hasMoonphase = True
+                elif propertyKind == 'moon':
+                    evtVal['value'] = eventMoonphase
+                    hasMoonphase = True
 
             #--- Add missing event properties.
-            if not hasMoonphase and self._propertyMoonphaseGuid is not None:
-                evt['values'].append({'property': self._propertyMoonphaseGuid, 'value': eventMoonphase})
+            if not hasMoonphase and moonphaseGuid is not None:
+                evt['values'].append({'property': moonphaseGuid, 'value': eventMoonphase})
 
             #--- Set scene tags.
-            if self.novel.scenes[scId].tags:
-                evt['tags'] = self.novel.scenes[scId].tags
+            if scene.tags:
+                evt['tags'] = scene.tags
 
             #--- Update characters, locations, and items.
             # Delete assignments.
-            newRel = []
-            for evtRel in evt['relationships']:
-                if evtRel['role'] == self._roleCharacterGuid:
-                    continue
-
-                elif evtRel['role'] == self._roleLocationGuid:
-                    continue
-
-                elif evtRel['role'] == self._roleItemGuid:
-                    continue
-
-                else:
-                    newRel.append(evtRel)
+            newRel = [evtRel for evtRel in evt['relationships'] if evtRel['role'] not in entityRoles]
 
             # Add characters.
-            if self.novel.scenes[scId].characters:
-                for crId in self.novel.scenes[scId].characters:
-                    newRel.append(
-                        {
-                            'entity': self._characterGuidById[crId],
-                            'percentAllocated': 1,
-                            'role': self._roleCharacterGuid,
-                        })
+            if scene.characters:
+                newRel.extend(
+                    {
+                        'entity': characterGuidById[crId],
+                        'percentAllocated': 1,
+                        'role': roleCharacterGuid,
+                    } for crId in scene.characters)
 
             # Add locations.
-            if self.novel.scenes[scId].locations:
-                for lcId in self.novel.scenes[scId].locations:
-                    newRel.append(
-                        {
-                            'entity': self._locationGuidById[lcId],
-                            'percentAllocated': 1,
-                            'role': self._roleLocationGuid,
-                        })
+            if scene.locations:
+                newRel.extend(
+                    {
+                        'entity': locationGuidById[lcId],
+                        'percentAllocated': 1,
+                        'role': roleLocationGuid,
+                    } for lcId in scene.locations)
 
             # Add items.
-            if self.novel.scenes[scId].items:
-                for itId in self.novel.scenes[scId].items:
-                    newRel.append(
-                        {
-                            'entity': self._itemGuidById[itId],
-                            'percentAllocated': 1,
-                            'role': self._roleItemGuid,
-                        })
+            if scene.items:
+                newRel.extend(
+                    {
+                        'entity': itemGuidById[itId],
+                        'percentAllocated': 1,
+                        'role': roleItemGuid,
+                    } for itId in scene.items)
 
             evt['relationships'] = newRel
 
-            #--- Assign "scene" events to the "Narrative" arc.
-            if self.novel.scenes[scId].scType == 0:
-                if narrativeArc not in evt['relationships']:
-                    evt['relationships'].append(narrativeArc)
-
-                #--- Assign events to arcs.
-                sceneArcs = string_to_list(self.novel.scenes[scId].scnArcs)
-                for arcName in arcs:
-                    if arcName in sceneArcs:
-                        if arcs[arcName] not in evt['relationships']:
-                            evt['relationships'].append(arcs[arcName])
-                    else:
-                        try:
-                            evt['relationships'].remove(arcs[arcName])
-                        except:
-                            pass
-
-            elif self.novel.scenes[scId].scType == 2:
-                if narrativeArc in evt['relationships']:
-                    evt['relationships'].remove(narrativeArc)
-
-                #--- Assign events to arcs.
-                sceneArcs = string_to_list(self.novel.scenes[scId].scnArcs)
-                for arcName in arcs:
-                    if arcName in sceneArcs:
-                        if arcs[arcName] not in evt['relationships']:
-                            evt['relationships'].append(arcs[arcName])
-                    else:
-                        try:
-                            evt['relationships'].remove(arcs[arcName])
-                        except:
-                            pass
-
-            elif self.novel.scenes[scId].scType == 1:
-                if narrativeArc in evt['relationships']:
-                    evt['relationships'].remove(narrativeArc)
-
-                #--- Clear arcs, if any.
-                sceneArcs = string_to_list(self.novel.scenes[scId].scnArcs)
-                for arcName in sceneArcs:
-                    evt['relationships'].remove(arcs[arcName])
+            # Entity/role pairs the event is already related to:
+            relationKeys = {(evtRel['entity'], evtRel['role']) for evtRel in newRel}
+
+            scType = scene.scType
+            if scType in (0, 1, 2):
+                if scene.scnArcs:
+                    sceneArcs = set(string_to_list(scene.scnArcs))
+                else:
+                    sceneArcs = set()
+                removedKeys = set()
+                # Entity/role pairs of the relationships to be deleted
+
+                #--- Assign "scene" events to the "Narrative" arc.
+                if scType == 0:
+                    if narrativeKey not in relationKeys:
+                        newRel.append(narrativeArc)
+                else:
+                    removedKeys.add(narrativeKey)
+
+                if scType == 1:
+                    #--- Clear arcs, if any.
+                    for arcName in sceneArcs:
+                        if arcName in arcKeys:
+                            removedKeys.add(arcKeys[arcName])
+                else:
+                    #--- Assign events to arcs.
+                    for arcName in arcs:
+                        if arcName in sceneArcs:
+                            if arcKeys[arcName] not in relationKeys:
+                                newRel.append(arcs[arcName])
+                        else:
+                            removedKeys.add(arcKeys[arcName])
+
+                if not removedKeys.isdisjoint(relationKeys):
+                    evt['relationships'] = [evtRel for evtRel in newRel
+                                            if (evtRel['entity'], evtRel['role']) not in removedKeys]
 
         #--- Delete "Trash" scenes.
         events = []
         for evt in self._jsonData['events']:
-            try:
-                scId = scIdsByTitle[evt['title']]
-            except KeyError:
+            if scIdsByTitle.get(evt['title']) not in self._trashEvents:
                 events.append(evt)
-            else:
-                if not scId in self._trashEvents:
-                    events.append(evt)
         self._jsonData['events'] = events
         save_timeline(self._jsonData, self.filePath)
@@ -5,6 +5,7 @@ For further information see https://github.com/peter88213/aeon2yw
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 from hashlib import pbkdf2_hmac
+from functools import lru_cache
 
 guidChars = list('ABCDEF0123456789')
 
@@ -24,6 +25,7 @@ def get_sub_guid(key, size):
     return guid
 
 
+@lru_cache(maxsize=1024)
 def get_uid(text):
     """Return a GUID for Aeon Timeline.
     
@@ -31,6 +33,8 @@ def get_uid(text):
         text -- string to generate a GUID from.
 
     GUID format: aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee
+    The GUID depends only on text, so the most recently used GUIDs 
+    are cached; the cache is bounded, so long sessions do not grow it.
     """
     text = text.encode('utf-8')
     sizes = [8, 4, 4, 4, 12]
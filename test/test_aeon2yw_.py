@@ -10,11 +10,19 @@ import os
 import unittest
 import sys
 from io import StringIO
+from io import BytesIO
 import zipfile
 import codecs
 import json
 import aeon2yw_
 from json import JSONDecodeError
+from unittest.mock import patch
+from aeon2ywlib import aeon2_fop
+from aeon2ywlib import aeon2_runtime
+from aeon2ywlib.json_timeline2 import generate_ids
+from pywriter.model.id_generator import create_id
+from pywriter.config.configuration import Configuration
+from pywriter.pywriter_globals import Error
 
 # Test environment
 
@@ -27,6 +35,7 @@ TEST_EXEC_PATH = TEST_PATH + '/yw7/'
 
 # Test data
 INI_FILE = TEST_EXEC_PATH + 'aeon2yw.ini'
+GLOBAL_INI_FILE = TEST_EXEC_PATH + 'aeon2yw_global.ini'
 TEST_YW7 = TEST_EXEC_PATH + 'yw7 Sample Project.yw7'
 TEST_YW7_BAK = TEST_EXEC_PATH + 'yw7 Sample Project.yw7.bak'
 TEST_AEON = TEST_EXEC_PATH + 'yw7 Sample Project.aeonzip'
@@ -53,6 +62,11 @@ def read_file(inputFile):
             return f.read()
 
 
+def read_bytes(inputFile):
+    with open(inputFile, 'rb') as f:
+        return f.read()
+
+
 def remove_all_testfiles():
     try:
         os.remove(TEST_YW7)
@@ -74,6 +88,10 @@ def remove_all_testfiles():
         os.remove(INI_FILE)
     except:
         pass
+    try:
+        os.remove(GLOBAL_INI_FILE)
+    except:
+        pass
 
 
 class NormalOperation(unittest.TestCase):
@@ -167,6 +185,20 @@ class NormalOperation(unittest.TestCase):
         aeon2yw_.run(TEST_YW7, silentMode=True)
         self.assertEqual(open_timeline(TEST_AEON), open_timeline(TEST_DATA_PATH + 'updated1_from_yw.aeonzip'))
 
+    # @unittest.skip('')
+    def test_update_aeon_unchanged(self):
+        copyfile(TEST_DATA_PATH + 'updated.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'created.aeonzip', TEST_AEON)
+        os.chdir(TEST_EXEC_PATH)
+        aeon2yw_.run(TEST_YW7, silentMode=True)
+        aeonBytes = read_bytes(TEST_AEON)
+        aeonInode = os.stat(TEST_AEON).st_ino
+        aeon2yw_.run(TEST_YW7, silentMode=True)
+        # The unchanged timeline is not rewritten, and the backup is not refreshed.
+        self.assertEqual(read_bytes(TEST_AEON), aeonBytes)
+        self.assertEqual(os.stat(TEST_AEON).st_ino, aeonInode)
+        self.assertEqual(read_bytes(TEST_AEON_BAK), read_bytes(TEST_DATA_PATH + 'created.aeonzip'))
+
     def tearDown(self):
         sys.stdout = self.original_output
         sys.stderr = self.original_err
@@ -189,6 +221,173 @@ class NormalOperation(unittest.TestCase):
         self.assertNotEqual(self.test_err.getvalue().strip(), value)
 
 
+class TimelineFileOperation(unittest.TestCase):
+    """Test case: Reading and writing the timeline file."""
+
+    def setUp(self):
+        try:
+            os.mkdir(TEST_EXEC_PATH)
+        except:
+            pass
+        remove_all_testfiles()
+        aeon2_fop._TIMELINE_CACHE.clear()
+
+    # @unittest.skip('')
+    def test_timeline_cache(self):
+        copyfile(TEST_DATA_PATH + 'created.aeonzip', TEST_AEON)
+        updatedData = open_timeline(TEST_DATA_PATH + 'updated_from_yw.aeonzip')
+        with patch.object(zipfile.ZipFile, 'read', autospec=True, side_effect=zipfile.ZipFile.read) as reader:
+            jsonData = aeon2_fop.open_timeline(TEST_AEON)
+            self.assertEqual(aeon2_fop.open_timeline(TEST_AEON), jsonData)
+            self.assertEqual(reader.call_count, 1)
+
+            # Same size, different modification time.
+            fileStat = os.stat(TEST_AEON)
+            os.utime(TEST_AEON, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 1000000000))
+            self.assertEqual(aeon2_fop.open_timeline(TEST_AEON), jsonData)
+            self.assertEqual(reader.call_count, 2)
+
+            # Different content.
+            copyfile(TEST_DATA_PATH + 'updated_from_yw.aeonzip', TEST_AEON)
+            self.assertEqual(aeon2_fop.open_timeline(TEST_AEON), updatedData)
+            self.assertEqual(reader.call_count, 3)
+
+    # @unittest.skip('')
+    def test_corrupted_member(self):
+        with zipfile.ZipFile(TEST_AEON, 'w', compression=zipfile.ZIP_DEFLATED) as myzip:
+            myzip.writestr('timeline.json', json.dumps({'text': 'x' * 10000}))
+        with zipfile.ZipFile(TEST_AEON, 'r') as myzip:
+            info = myzip.getinfo('timeline.json')
+        with open(TEST_AEON, 'rb') as f:
+            zipBytes = bytearray(f.read())
+
+        # Damage the compressed data.
+        i = info.header_offset + 30 + len(info.filename) + info.compress_size // 2
+        zipBytes[i] ^= 0xFF
+        with open(TEST_AEON, 'wb') as f:
+            f.write(zipBytes)
+        with self.assertRaises(Error) as context:
+            aeon2_fop.open_timeline(TEST_AEON)
+        self.assertEqual(str(context.exception), aeon2_fop.UNREADABLE_TIMELINE_MSG)
+
+    # @unittest.skip('')
+    def test_unsupported_member(self):
+        # Patch the compression method and the flags in the local and central headers.
+        for headerOffsets in ((8, 10, b'\x63\x00'), (6, 8, b'\x01\x00')):
+            zipBuffer = BytesIO()
+            with zipfile.ZipFile(zipBuffer, 'w') as myzip:
+                myzip.writestr('timeline.json', '{}')
+            zipBytes = bytearray(zipBuffer.getvalue())
+            localOffset, centralOffset, value = headerOffsets
+            i = zipBytes.find(b'PK\x03\x04') + localOffset
+            zipBytes[i:i + 2] = value
+            i = zipBytes.find(b'PK\x01\x02') + centralOffset
+            zipBytes[i:i + 2] = value
+            with open(TEST_AEON, 'wb') as f:
+                f.write(zipBytes)
+            with self.assertRaises(Error) as context:
+                aeon2_fop.open_timeline(TEST_AEON)
+            self.assertEqual(str(context.exception), aeon2_fop.UNREADABLE_TIMELINE_MSG)
+
+    # @unittest.skip('')
+    def test_streaming_without_ijson(self):
+        copyfile(TEST_DATA_PATH + 'updated_from_yw.aeonzip', TEST_AEON)
+        with patch.object(aeon2_fop, 'STREAMING_SIZE', 0), patch.object(aeon2_fop, 'ijson', None):
+            self.assertEqual(aeon2_fop.open_timeline(TEST_AEON), open_timeline(TEST_DATA_PATH + 'updated_from_yw.aeonzip'))
+
+    @unittest.skipIf(aeon2_fop.ijson is None, 'ijson is not installed')
+    def test_streaming_with_ijson(self):
+        copyfile(TEST_DATA_PATH + 'updated_from_yw.aeonzip', TEST_AEON)
+        with patch.object(aeon2_fop, 'STREAMING_SIZE', 0), \
+                patch.object(aeon2_fop, 'stream_json_member', wraps=aeon2_fop.stream_json_member) as streamer:
+            self.assertEqual(aeon2_fop.open_timeline(TEST_AEON), open_timeline(TEST_DATA_PATH + 'updated_from_yw.aeonzip'))
+            self.assertEqual(streamer.call_count, 1)
+
+    # @unittest.skip('')
+    def test_compression_threshold(self):
+        for size, compressType in ((aeon2_fop.STORED_SIZE - 100, zipfile.ZIP_STORED),
+                                   (aeon2_fop.STORED_SIZE + 100, zipfile.ZIP_DEFLATED)):
+            jsonData = {'text': 'x' * size}
+            aeon2_fop.save_timeline(jsonData, TEST_AEON)
+            with zipfile.ZipFile(TEST_AEON) as myzip:
+                self.assertIsNone(myzip.testzip())
+                self.assertEqual(myzip.getinfo('timeline.json').compress_type, compressType)
+                self.assertEqual(json.loads(myzip.read('timeline.json')), jsonData)
+            remove_all_testfiles()
+            aeon2_fop._TIMELINE_CACHE.clear()
+
+    def tearDown(self):
+        remove_all_testfiles()
+        aeon2_fop._TIMELINE_CACHE.clear()
+
+
+class IdGeneration(unittest.TestCase):
+
+    # @unittest.skip('')
+    def test_generate_ids(self):
+        for elements in ({'1': None, '2': None, '4': None, '7': None, '8': None}, ['2', '3', '5']):
+            newIds = generate_ids(elements)
+            for __ in range(10):
+                expectedId = create_id(elements)
+                newId = next(newIds)
+                self.assertEqual(newId, expectedId)
+                self.assertNotIn(newId, elements)
+                if isinstance(elements, dict):
+                    elements[newId] = None
+                else:
+                    elements.append(newId)
+
+
+class ConfigurationCache(unittest.TestCase):
+    """Test case: Merging and caching the INI file configuration."""
+
+    def setUp(self):
+        try:
+            os.mkdir(TEST_EXEC_PATH)
+        except:
+            pass
+        remove_all_testfiles()
+        aeon2_runtime._CONFIG_CACHE.clear()
+
+    def write_ini(self, iniFile, settings, options):
+        configuration = Configuration(settings, options)
+        configuration.write(iniFile)
+
+    # @unittest.skip('')
+    def test_ini_override_and_change(self):
+        settings = dict(narrative_arc='Narrative', property_notes='Notes', role_item='Item')
+        options = dict(scenes_only=True, add_moonphase=False)
+        iniFiles = [GLOBAL_INI_FILE, INI_FILE]
+        self.write_ini(GLOBAL_INI_FILE, dict(narrative_arc='Global arc', property_notes='Global notes'), dict(add_moonphase=True))
+        self.write_ini(INI_FILE, dict(narrative_arc='Local arc'), dict(scenes_only=False))
+        expected = dict(
+            narrative_arc='Local arc',
+            property_notes='Global notes',
+            role_item='Item',
+            scenes_only=False,
+            add_moonphase=True,
+            )
+        self.assertEqual(aeon2_runtime.merge_config(iniFiles, settings, options), expected)
+        self.assertEqual(aeon2_runtime.merge_config(iniFiles, settings, options), expected)
+
+        # Change the local INI file, keeping its size.
+        iniStat = os.stat(INI_FILE)
+        self.write_ini(INI_FILE, dict(narrative_arc='Other arc'), dict(scenes_only=False))
+        os.utime(INI_FILE, ns=(iniStat.st_atime_ns, iniStat.st_mtime_ns + 1000000000))
+        expected['narrative_arc'] = 'Other arc'
+        self.assertEqual(aeon2_runtime.merge_config(iniFiles, settings, options), expected)
+
+        # Delete the local INI file.
+        os.remove(INI_FILE)
+        expected['narrative_arc'] = 'Global arc'
+        expected['scenes_only'] = True
+        self.assertEqual(aeon2_runtime.merge_config(iniFiles, settings, options), expected)
+
+    def tearDown(self):
+        remove_all_testfiles()
+        aeon2_runtime._CONFIG_CACHE.clear()
+
+
 def main():
     unittest.main()
 